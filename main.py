@@ -3,12 +3,16 @@ import os
 import base64
 from mistralai import Mistral
 import google.generativeai as genai
-from PIL import Image
+from PIL import Image, ImageOps
+import numpy as np
 import io
 import requests
 import re
 import math
 import json
+import csv
+import datetime
+import itertools
 # From python-dotenv package:
 from dotenv import load_dotenv
 
@@ -172,6 +176,160 @@ if "tips_history" not in st.session_state:
     st.session_state["tips_history"] = []
 if "gemini_chat" not in st.session_state:
     st.session_state["gemini_chat"] = None
+if "preflight_rejection" not in st.session_state:
+    st.session_state["preflight_rejection"] = None
+if "week_rollups" not in st.session_state:
+    st.session_state["week_rollups"] = {}
+if "period_rollups" not in st.session_state:
+    st.session_state["period_rollups"] = {}
+
+# Bill denominations in distribution order; bill count lists hold counts in this same order
+DENOMINATIONS = (20, 10, 5, 1)
+
+def format_bills(counts):
+    return ",".join(f"{count}x${denom}" for denom, count in zip(DENOMINATIONS, counts) if count > 0)
+
+class Partner:
+    # Slotted record for one partner; display strings are built on demand instead of stored
+    __slots__ = ("name", "number", "hours", "exact_tip_amount", "tip_amount", "bills")
+    
+    def __init__(self, name, number, hours, exact_tip_amount=0.0, tip_amount=0, bills=None):
+        self.name = name
+        self.number = number
+        self.hours = hours  # Kept as entered so it displays unchanged; use float(partner.hours) for math
+        self.exact_tip_amount = exact_tip_amount
+        self.tip_amount = tip_amount
+        self.bills = list(bills) if bills is not None else [0] * len(DENOMINATIONS)
+    
+    @property
+    def bills_text(self):
+        return format_bills(self.bills)
+    
+    @property
+    def formatted_output(self):
+        return (
+            f"Partner Name: {self.name} | #: {self.number} | "
+            f"Hours: {self.hours} | Exact: ${self.exact_tip_amount:.2f} | "
+            f"Cash: ${self.tip_amount} | Bills: {self.bills_text}"
+        )
+    
+    def to_row(self):
+        # Compact immutable snapshot used for history entries
+        return (self.name, self.number, self.hours, self.exact_tip_amount, self.tip_amount, tuple(self.bills))
+    
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+class Distribution:
+    # Slotted record for one saved week; partners are stored as Partner.to_row() tuples
+    __slots__ = ("week", "total_amount", "total_hours", "hourly_rate", "rotation_start", "saved_on", "partners")
+    
+    def __init__(self, week, total_amount, total_hours, hourly_rate, rotation_start, saved_on, partners):
+        self.week = week
+        self.total_amount = total_amount
+        self.total_hours = total_hours
+        self.hourly_rate = hourly_rate
+        self.rotation_start = rotation_start
+        self.saved_on = saved_on
+        self.partners = tuple(partners)
+    
+    def iter_partners(self):
+        for row in self.partners:
+            yield Partner.from_row(row)
+    
+    def to_row(self):
+        # Plain tuple of built-ins stored in tips_history
+        return (self.week, self.total_amount, self.total_hours, self.hourly_rate,
+                self.rotation_start, self.saved_on, self.partners)
+    
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+# Number of most recent weeks shown in the report's week-by-week trend
+REPORT_TREND_WEEKS = 13
+
+# Report rollups - updated once per "Save to History" so reports never rescan tips_history
+def new_rollup():
+    return {
+        "weeks": 0,
+        "total_amount": 0.0,
+        "total_hours": 0.0,
+        "cash": 0,
+        "bills": [0] * len(DENOMINATIONS),
+        "partners": {}
+    }
+
+def new_partner_rollup():
+    return {
+        "weeks": 0,
+        "hours": 0.0,
+        "exact": 0.0,
+        "cash": 0,
+        "bills": [0] * len(DENOMINATIONS),
+        "rotation_starts": 0
+    }
+
+def report_periods(saved_on):
+    # Each saved week lands in its month, its quarter and the all-time bucket
+    quarter = (saved_on.month - 1) // 3 + 1
+    return [
+        f"Month {saved_on.year}-{saved_on.month:02d}",
+        f"Quarter {saved_on.year}-Q{quarter}",
+        "All Time"
+    ]
+
+def update_rollups(distribution):
+    saved_on = datetime.date.fromisoformat(distribution.saved_on)
+    partners = list(distribution.iter_partners())
+    
+    # Per-week summary for the week-by-week trend
+    rotation_leader = next((partner.name for partner in partners if partner.number == distribution.rotation_start), "")
+    st.session_state["week_rollups"][distribution.week] = {
+        "saved_on": distribution.saved_on,
+        "total_amount": distribution.total_amount,
+        "total_hours": distribution.total_hours,
+        "hourly_rate": distribution.hourly_rate,
+        "rotation_leader": rotation_leader
+    }
+    
+    # Month, quarter and all-time rollups with per-partner totals
+    for period in report_periods(saved_on):
+        rollup = st.session_state["period_rollups"].setdefault(period, new_rollup())
+        rollup["weeks"] += 1
+        rollup["total_amount"] += distribution.total_amount
+        rollup["total_hours"] += distribution.total_hours
+        
+        for partner in partners:
+            partner_rollup = rollup["partners"].setdefault(partner.name, new_partner_rollup())
+            partner_rollup["weeks"] += 1
+            partner_rollup["hours"] += float(partner.hours)
+            partner_rollup["exact"] += partner.exact_tip_amount
+            partner_rollup["cash"] += partner.tip_amount
+            rollup["cash"] += partner.tip_amount
+            for i, count in enumerate(partner.bills):
+                partner_rollup["bills"][i] += count
+                rollup["bills"][i] += count
+            if partner.number == distribution.rotation_start:
+                partner_rollup["rotation_starts"] += 1
+
+def generate_report_csv(period, rollup):
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow([
+        "Period", "Partner Name", "Weeks", "Hours", "Exact", "Cash", "Avg Hourly Rate",
+        *[f"${denom} Bills" for denom in DENOMINATIONS], "Rotation Starts", "Rounding Difference"
+    ])
+    for name, partner in rollup["partners"].items():
+        avg_rate = partner["exact"] / partner["hours"] if partner["hours"] else 0.0
+        writer.writerow([
+            period, name, partner["weeks"], f"{partner['hours']:.2f}", f"{partner['exact']:.2f}",
+            partner["cash"], f"{avg_rate:.2f}",
+            *partner["bills"],
+            partner["rotation_starts"], f"{partner['cash'] - partner['exact']:.2f}"
+        ])
+    return output.getvalue()
 
 # Get API keys from environment variables
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
@@ -201,8 +359,92 @@ safety_settings = [
     {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
 ]
 
+# Pre-flight thresholds for uploads - checked locally before any Gemini call
+PREFLIGHT_MIN_SIDE = 600          # Shortest side in pixels needed to read names and hours
+PREFLIGHT_ANALYSIS_SIDE = 1024    # Checks run on a downscaled copy to stay fast
+PREFLIGHT_MIN_HIGHLIGHT = 90.0    # Brightest gray level below this means the photo is underexposed
+PREFLIGHT_MIN_CONTRAST = 40.0     # Text vs background gray difference below this is unreadable
+PREFLIGHT_LOW_CONTRAST = 100.0    # Darkest-to-lightest spread below this gets auto-contrast
+PREFLIGHT_MIN_SHARPNESS = 0.15    # Edge strength relative to text contrast below this is too blurry
+
+def flatten_transparency(image):
+    # Put transparent images on white - a plain RGB convert would turn the background black
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image
+
+def preflight_image(image_bytes):
+    # Returns a list of problems that should block OCR and whether the photo needs auto-contrast
+    problems = []
+    
+    sample = Image.open(io.BytesIO(image_bytes))
+    width, height = sample.size
+    if min(width, height) < PREFLIGHT_MIN_SIDE:
+        problems.append(f"Image is too small ({width}x{height}). Please upload a photo at least {PREFLIGHT_MIN_SIDE} pixels on the shortest side.")
+        return problems, False
+    
+    # JPEGs decode straight to a small grayscale copy; other formats are reduced before converting
+    scale = PREFLIGHT_ANALYSIS_SIDE / max(width, height)
+    sample.draft("L", (int(width * scale), int(height * scale)))
+    if sample.mode not in ("L", "LA", "RGB", "RGBA"):
+        sample = sample.convert("RGBA" if "transparency" in sample.info else "RGB")
+    factor = math.ceil(max(sample.size) / PREFLIGHT_ANALYSIS_SIDE)
+    if factor > 1:
+        sample = sample.reduce(factor)
+    gray = np.asarray(flatten_transparency(sample).convert("L"), dtype=np.float32)
+    
+    # Percentiles instead of mean/std so mostly empty pages and dark-mode screenshots aren't penalized
+    shadow, background_level, highlight = np.percentile(gray, [0.1, 50, 99.9])
+    spread = highlight - shadow
+    
+    # Text contrast against the background, whether the text is darker (paper) or lighter (dark mode)
+    text_contrast = max(background_level - shadow, highlight - background_level)
+    
+    # Strongest Laplacian responses - sharp text edges score close to the text contrast, blurry ones far below
+    laplacian = (
+        gray[:-2, 1:-1] + gray[2:, 1:-1] + gray[1:-1, :-2] + gray[1:-1, 2:]
+        - 4 * gray[1:-1, 1:-1]
+    )
+    sharpness = np.percentile(np.abs(laplacian), 99.9) / max(text_contrast, 1.0)
+    
+    if highlight < PREFLIGHT_MIN_HIGHLIGHT:
+        problems.append("Image is too dark. Please retake the photo with more light.")
+    elif text_contrast < PREFLIGHT_MIN_CONTRAST:
+        problems.append("Image has almost no contrast and doesn't look like a schedule. Please retake the photo.")
+    elif sharpness < PREFLIGHT_MIN_SHARPNESS:
+        problems.append("Image is too blurry. Please hold the camera steady and retake the photo.")
+    
+    # Readable but washed out - stretch the levels instead of asking for a retake
+    return problems, spread < PREFLIGHT_LOW_CONTRAST
+
+def prepare_image(image_bytes, washed_out):
+    # Full-size corrections, done only for images that are actually sent to Gemini
+    image = ImageOps.exif_transpose(Image.open(io.BytesIO(image_bytes)))
+    image = flatten_transparency(image)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    if washed_out:
+        image = ImageOps.autocontrast(image, cutoff=0.5)
+    return image
+
 uploaded_file = st.file_uploader("Upload an Image file", type=["jpg", "jpeg", "png"])
 
+# Show the last pre-flight rejection for this upload and let the user override it
+skip_preflight = False
+rejection = st.session_state["preflight_rejection"]
+if rejection and (not uploaded_file or rejection["file_id"] != uploaded_file.file_id):
+    # A different upload (e.g. a retake also named image.jpg) is checked afresh
+    st.session_state["preflight_rejection"] = None
+    st.session_state.pop("skip_preflight", None)
+    rejection = None
+if rejection:
+    for problem in rejection["problems"]:
+        st.error(problem)
+    skip_preflight = st.checkbox("Process anyway - the photo is readable", key="skip_preflight")
+
 # Process Button & OCR Handling
 if st.button("Process", use_container_width=True):
     if not uploaded_file:
@@ -210,6 +452,20 @@ if st.button("Process", use_container_width=True):
     else:
         with st.spinner("Processing the image..."):
             try:
+                image_bytes = uploaded_file.getvalue()
+                preview_src = None
+                
+                # Run local pre-flight checks before spending any API calls
+                problems, washed_out = preflight_image(image_bytes)
+                if problems and not skip_preflight:
+                    st.session_state["preflight_rejection"] = {"file_id": uploaded_file.file_id, "problems": problems}
+                    st.rerun()
+                st.session_state["preflight_rejection"] = None
+                image = prepare_image(image_bytes, washed_out)
+                
+                # Store the original file bytes for preview only once the upload is accepted
+                st.session_state["image_bytes"] = image_bytes
+                
                 # Initialize Gemini 1.5 Flash model for vision tasks
                 model = genai.GenerativeModel(
                     'gemini-1.5-flash',
@@ -217,11 +473,6 @@ if st.button("Process", use_container_width=True):
                     safety_settings=safety_settings
                 )
                 
-                # Store the original file bytes for preview
-                st.session_state["image_bytes"] = uploaded_file.read()
-                image = Image.open(io.BytesIO(st.session_state["image_bytes"]))
-                preview_src = None
-                
                 # Create structured prompt for better OCR
                 prompt = """Please analyze this image and:
                 1. Extract all visible text, especially focusing on names and hours worked
@@ -299,23 +550,23 @@ if st.session_state["ocr_result"]:
                 if json_match:
                     partner_data_str = json_match.group(0)
                 
-                partner_data = json.loads(partner_data_str)
-                
-                # Add partner numbers
-                for i, partner in enumerate(partner_data):
-                    partner["number"] = i + 1
+                # Build partner records with partner numbers
+                partner_data = [
+                    Partner(partner["name"], i + 1, partner["hours"])
+                    for i, partner in enumerate(json.loads(partner_data_str))
+                ]
                 
                 st.session_state["partner_data"] = partner_data
                 
                 # Calculate total hours
-                total_hours = sum(float(partner["hours"]) for partner in partner_data)
+                total_hours = sum(float(partner.hours) for partner in partner_data)
                 st.session_state["total_hours"] = total_hours
                 
                 # Display partner data
                 st.write(f"Total Hours: {total_hours}")
                 st.write("Partner Data:")
                 for partner in partner_data:
-                    st.write(f"{partner['name']} - {partner['hours']} hours")
+                    st.write(f"{partner.name} - {partner.hours} hours")
                 
                 # Compare with document's total hours if available
                 try:
@@ -353,12 +604,12 @@ if st.session_state["ocr_result"]:
                 hours = st.number_input(f"Hours", min_value=0.0, step=0.25, key=f"hours_{i}")
             
             if name:  # Only add if name is provided
-                manual_partner_data.append({"name": name, "number": i+1, "hours": hours})
+                manual_partner_data.append(Partner(name, i+1, hours))
         
         if st.button("Save Partner Data", use_container_width=True):
-            if all(partner["name"] for partner in manual_partner_data):
+            if all(partner.name for partner in manual_partner_data):
                 st.session_state["partner_data"] = manual_partner_data
-                st.session_state["total_hours"] = sum(float(partner["hours"]) for partner in manual_partner_data)
+                st.session_state["total_hours"] = sum(float(partner.hours) for partner in manual_partner_data)
                 st.success("Partner data saved successfully!")
             else:
                 st.error("Please provide names for all partners.")
@@ -385,16 +636,13 @@ if st.session_state["ocr_result"]:
                 
                 for partner in partner_data:
                     # Calculate exact tip amount (hours * hourly_rate)
-                    exact_amount = float(partner["hours"]) * hourly_rate
-                    
-                    # Store the exact unrounded amount
-                    partner["raw_tip_amount"] = exact_amount
+                    exact_amount = float(partner.hours) * hourly_rate
                     
                     # Store the unrounded amount for display purposes
-                    partner["exact_tip_amount"] = exact_amount
+                    partner.exact_tip_amount = exact_amount
                     
                     # Round directly to nearest dollar for cash distribution (e.g., $43.1725 → $43)
-                    partner["tip_amount"] = round(exact_amount)
+                    partner.tip_amount = round(exact_amount)
                 
                 # Add information about the hourly rate and rounding policy
                 st.info(f"""
@@ -402,57 +650,37 @@ if st.session_state["ocr_result"]:
                 """)
                 
                 # Distribute bills
-                denominations = [20, 10, 5, 1]
-                
                 # Determine starting partner index based on rotation
                 num_partners = len(partner_data)
                 start_index = (st.session_state["week_counter"] - 1) % num_partners
+                st.session_state["rotation_start"] = partner_data[start_index].number
                 
-                # Process each partner's distribution
-                remaining_amounts = {}
-                for partner in partner_data:
-                    remaining_amounts[partner["number"]] = partner["tip_amount"]
+                # Process each partner's distribution, indexed by position in partner_data
+                remaining_amounts = [partner.tip_amount for partner in partner_data]
                 
                 # Initialize bill counts for each partner
                 for partner in partner_data:
-                    partner["bills"] = {20: 0, 10: 0, 5: 0, 1: 0}
+                    partner.bills = [0] * len(DENOMINATIONS)
+                
+                # Create an order of partners, starting with the rotation partner
+                partner_order = [(start_index + i) % num_partners for i in range(num_partners)]
                 
                 # Distribute by denomination, starting with largest
-                for denomination in denominations:
-                    # Create an order of partners, starting with the rotation partner
-                    partner_order = [(start_index + i) % num_partners for i in range(num_partners)]
-                    
+                for denom_idx, denomination in enumerate(DENOMINATIONS):
                     # Keep distributing bills of this denomination while possible
                     while True:
                         distributed = False
                         for idx in partner_order:
-                            partner_num = partner_data[idx]["number"]
-                            if remaining_amounts[partner_num] >= denomination:
+                            if remaining_amounts[idx] >= denomination:
                                 # Give this partner a bill of this denomination
-                                partner_data[idx]["bills"][denomination] += 1
-                                remaining_amounts[partner_num] -= denomination
+                                partner_data[idx].bills[denom_idx] += 1
+                                remaining_amounts[idx] -= denomination
                                 distributed = True
                         
                         # If we couldn't distribute any more of this denomination, move to next
                         if not distributed:
                             break
                 
-                # Add the bill distribution to each partner's data
-                for partner in partner_data:
-                    bills_text = []
-                    for denom in [20, 10, 5, 1]:
-                        if partner["bills"][denom] > 0:
-                            bills_text.append(f"{partner['bills'][denom]}x${denom}")
-                    
-                    partner["bills_text"] = ",".join(bills_text)
-                    
-                    # Format for copy-paste
-                    partner["formatted_output"] = (
-                        f"Partner Name: {partner['name']} | #: {partner['number']} | "
-                        f"Hours: {partner['hours']} | Exact: ${partner['exact_tip_amount']:.2f} | "
-                        f"Cash: ${partner['tip_amount']} | Bills: {partner['bills_text']}"
-                    )
-                
                 # Save to session state
                 st.session_state["distributed_tips"] = partner_data
                 st.session_state["total_tip_amount"] = total_tip_amount
@@ -483,16 +711,15 @@ if st.session_state["ocr_result"]:
         # Prepare tip data with calculations shown
         tip_data = []
         for partner in st.session_state["distributed_tips"]:
-            exact_amount = partner['exact_tip_amount']
-            calculation = f"{partner['hours']} × ${hourly_rate:.2f} = ${exact_amount:.2f}"
+            calculation = f"{partner.hours} × ${hourly_rate:.2f} = ${partner.exact_tip_amount:.2f}"
             
             tip_data.append({
-                "Partner Name": partner["name"],
-                "#": partner["number"],
-                "Hours": partner["hours"],
+                "Partner Name": partner.name,
+                "#": partner.number,
+                "Hours": partner.hours,
                 "Calculation": calculation,
-                "Cash Amount": f"${partner['tip_amount']}",
-                "Bills": partner["bills_text"]
+                "Cash Amount": f"${partner.tip_amount}",
+                "Bills": partner.bills_text
             })
         
         # Use card-based layout with compact design for all devices
@@ -524,44 +751,91 @@ if st.session_state["ocr_result"]:
         # Display copy-paste ready format
         with st.expander("Copy-paste format"):
             for partner in st.session_state["distributed_tips"]:
-                st.text(partner["formatted_output"])
+                st.text(partner.formatted_output)
         
-        # Save distribution to history
-        if st.button("Save to History", use_container_width=True):
-            distribution = {
-                "week": st.session_state["week_counter"] - 1,
-                "total_amount": st.session_state["total_tip_amount"],
-                "total_hours": st.session_state["total_hours"],
-                "partners": st.session_state["distributed_tips"]
-            }
+        # Save distribution to history - each week is saved once so reports never double count it
+        week_saved = (st.session_state["week_counter"] - 1) in st.session_state["week_rollups"]
+        if st.button("Save to History", use_container_width=True, disabled=week_saved):
+            # Snapshot partners as compact rows so later recalculations can't alter history
+            distribution = Distribution(
+                week=st.session_state["week_counter"] - 1,
+                total_amount=st.session_state["total_tip_amount"],
+                total_hours=st.session_state["total_hours"],
+                hourly_rate=st.session_state["hourly_rate"],
+                rotation_start=st.session_state["rotation_start"],
+                saved_on=datetime.date.today().isoformat(),
+                partners=[partner.to_row() for partner in st.session_state["distributed_tips"]]
+            )
             
             if "tips_history" not in st.session_state:
                 st.session_state["tips_history"] = []
             
-            st.session_state["tips_history"].append(distribution)
+            # History keeps compact rows; rebuild with Distribution.from_row() to read them
+            st.session_state["tips_history"].append(distribution.to_row())
+            update_rollups(distribution)
             st.success("Distribution saved to history!")
     
     # History section - simplified for mobile
     if "tips_history" in st.session_state and st.session_state["tips_history"]:
         with st.expander("View Distribution History"):
-            for i, dist in enumerate(st.session_state["tips_history"]):
+            for i, row in enumerate(st.session_state["tips_history"]):
+                dist = Distribution.from_row(row)
                 with st.container():
                     st.markdown(f"""
                     <div class="custom-card">
-                        <h4 style="margin: 0; color: #00704A;">Week {dist['week']}</h4>
-                        <p>Total: ${dist['total_amount']} for {dist['total_hours']} hours</p>
+                        <h4 style="margin: 0; color: #00704A;">Week {dist.week}</h4>
+                        <p>Total: ${dist.total_amount} for {dist.total_hours} hours</p>
                     </div>
                     """, unsafe_allow_html=True)
                     
-                    for partner in dist["partners"]:
+                    for partner in dist.iter_partners():
                         st.markdown(f"""
                         <div style="padding-left: 15px; margin-bottom: 5px;">
-                            {partner['name']} | #{partner['number']} | {partner['hours']} hours | ${partner['tip_amount']} | {partner['bills_text']}
+                            {partner.name} | #{partner.number} | {partner.hours} hours | ${partner.tip_amount} | {partner.bills_text}
                         </div>
                         """, unsafe_allow_html=True)
                     
                     st.markdown("<hr style='margin: 15px 0;'>", unsafe_allow_html=True)
     
+    # Reports section - reads only the precomputed rollups, so cost does not grow with history
+    if st.session_state["period_rollups"]:
+        with st.expander("View Reports"):
+            period = st.selectbox("Report Period", sorted(st.session_state["period_rollups"].keys(), reverse=True))
+            rollup = st.session_state["period_rollups"][period]
+            period_rate = rollup["total_amount"] / rollup["total_hours"] if rollup["total_hours"] else 0.0
+            
+            st.markdown(f"""
+            <div class="custom-card">
+                <h4 style="margin: 0; color: #00704A;">{period}</h4>
+                <p>{rollup['weeks']} weeks | Total: ${rollup['total_amount']:.2f} for {rollup['total_hours']:.2f} hours | Avg: ${period_rate:.2f} per hour</p>
+                <p>Cash: ${rollup['cash']} | Bills: {format_bills(rollup['bills'])}</p>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            for name, partner in rollup["partners"].items():
+                avg_rate = partner["exact"] / partner["hours"] if partner["hours"] else 0.0
+                st.markdown(f"""
+                <div style="padding-left: 15px; margin-bottom: 5px;">
+                    {name} | {partner['weeks']} weeks | {partner['hours']:.2f} hours | ${partner['cash']} (avg ${avg_rate:.2f}/hr) | {format_bills(partner['bills'])} | Led rotation {partner['rotation_starts']}x
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # Week-by-week trend of the most recent weeks - rate and who led the bill rotation
+            st.markdown("<h4 style='margin: 15px 0 5px 0; color: #00704A;'>Recent Weeks</h4>", unsafe_allow_html=True)
+            recent_weeks = itertools.islice(reversed(st.session_state["week_rollups"].items()), REPORT_TREND_WEEKS)
+            for week, summary in recent_weeks:
+                st.markdown(f"""
+                <div style="padding-left: 15px; margin-bottom: 5px;">
+                    Week {week} ({summary['saved_on']}) | ${summary['total_amount']:.2f} for {summary['total_hours']:.2f} hours | ${summary['hourly_rate']:.2f} per hour | Rotation led by {summary['rotation_leader']}
+                </div>
+                """, unsafe_allow_html=True)
+            
+            # Download report as CSV
+            csv_b64 = base64.b64encode(generate_report_csv(period, rollup).encode()).decode()
+            csv_filename = "tip_report_" + period.lower().replace(" ", "_") + ".csv"
+            csv_href = f'<div style="margin: 10px 0;"><a href="data:text/csv;base64,{csv_b64}" download="{csv_filename}" class="stButton" style="text-decoration: none;"><button style="width: 100%; border-radius: 20px; background-color: #00704A; color: white; padding: 12px; border: none; font-weight: 500;">Download Report CSV</button></a></div>'
+            st.markdown(csv_href, unsafe_allow_html=True)
+    
     # Download options for OCR result - more touch-friendly
     if st.session_state.get("tips_calculated", False):
         # Generate HTML table for download